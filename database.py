@@ -2,6 +2,8 @@ from csv import DictReader, DictWriter
 from pathlib import Path
 import sqlite3
 
+SCHEMA_VERSION = 1
+
 
 class Database:
 	def __init__(self, path: Path):
@@ -68,9 +70,12 @@ class SQLiteDatabase(Database):
 		self.path = path
 		self.conn = sqlite3.connect(path)
 		self.cursor = self.conn.cursor()
+		# stored sentences are a cache, so trade fsync-per-commit for speed
+		self.cursor.execute("PRAGMA journal_mode = WAL")
+		self.cursor.execute("PRAGMA synchronous = NORMAL")
+		self._create_table()
 
 	def get_sentence(self, owner, repo, pr_no):
-		self._create_table()
 		self.cursor.execute(
 			"SELECT sentence FROM sentences WHERE owner = ? AND repo = ? AND pr_no = ?",
 			(owner, repo, pr_no),
@@ -79,8 +84,6 @@ class SQLiteDatabase(Database):
 		return result[0] if result else None
 
 	def store_sentence(self, owner, repo, pr_no, sentence):
-		self._create_table()
-
 		self.cursor.execute(
 			"INSERT INTO sentences (owner, repo, pr_no, sentence) VALUES (?, ?, ?, ?)",
 			(owner, repo, pr_no, sentence),
@@ -88,7 +91,6 @@ class SQLiteDatabase(Database):
 		self.conn.commit()
 
 	def delete_sentence(self, owner, repo, pr_no):
-		self._create_table()
 		self.cursor.execute(
 			"DELETE FROM sentences WHERE owner = ? AND repo = ? AND pr_no = ?",
 			(owner, repo, pr_no),
@@ -96,10 +98,16 @@ class SQLiteDatabase(Database):
 		self.conn.commit()
 
 	def _create_table(self):
+		"""Create the schema, unless the database file is already up to date."""
+		self.cursor.execute("PRAGMA user_version")
+		if self.cursor.fetchone()[0] >= SCHEMA_VERSION:
+			return
+
 		self.cursor.execute(
 			"CREATE TABLE IF NOT EXISTS sentences (owner TEXT, repo TEXT, pr_no TEXT, sentence TEXT)"
 		)
 		self.cursor.execute(
 			"CREATE INDEX IF NOT EXISTS idx_owner_repo_pr_no ON sentences (owner, repo, pr_no)"
 		)
+		self.cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
 		self.conn.commit()
@@ -1,4 +1,23 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+CLOSED_ISSUES_QUERY = """
+	query ($owner: String!, $repo: String!, $prNo: Int!, $first: Int!) {
+		repository(owner: $owner, name: $repo) {
+			pullRequest(number: $prNo) {
+				closingIssuesReferences(first: $first) {
+					edges {
+						node {
+							body
+							title
+						}
+					}
+				}
+			}
+		}
+	}
+"""
 
 
 class GitHubClient:
@@ -6,15 +25,30 @@ class GitHubClient:
 
 	def __init__(self, token: str):
 		self.session = requests.Session()
+		self.session.mount(
+			"https://",
+			HTTPAdapter(
+				pool_connections=10,
+				pool_maxsize=10,
+				max_retries=Retry(total=3, backoff_factor=0.3),
+			),
+		)
 		self.session.headers.update(
 			{
 				"Authorization": f"Bearer {token}",
 			}
 		)
 
-	def get_text(self, url: str) -> str:
-		"""Get patch from GitHub API."""
-		return self.session.get(url).text
+	def get_pr_patch(self, url: str, max_size: int) -> str | None:
+		"""Get patch from GitHub API, or None if it is larger than `max_size` bytes."""
+		with self.session.get(url, stream=True) as response:
+			content = bytearray()
+			for chunk in response.iter_content(chunk_size=65536):
+				content += chunk
+				if len(content) > max_size:
+					return None
+
+			return content.decode(response.encoding or "utf-8", errors="replace")
 
 	def get_closed_issues(
 		self, owner: str, repo: str, pr_no: str, first: int = 1
@@ -23,22 +57,13 @@ class GitHubClient:
 		response = self.session.post(
 			"https://api.github.com/graphql",
 			json={
-				"query": f"""
-					query {{
-						repository(owner: "{owner}", name: "{repo}") {{
-							pullRequest(number: {pr_no}) {{
-								closingIssuesReferences (first: {first}) {{
-									edges {{
-										node {{
-											body
-											title
-										}}
-									}}
-								}}
-							}}
-						}}
-					}}
-				"""
+				"query": CLOSED_ISSUES_QUERY,
+				"variables": {
+					"owner": owner,
+					"repo": repo,
+					"prNo": int(pr_no),
+					"first": first,
+				},
 			},
 		).json()
 
@@ -1,4 +1,5 @@
 import re
+from functools import lru_cache
 from pathlib import Path
 
 import typer
@@ -10,7 +11,12 @@ from database import Database, CSVDatabase, SQLiteDatabase
 
 app = typer.Typer()
 config = dotenv_values(".env")
-pr_re = re.compile(r"pull/(\d+)")  # reqex to find PR number
+pr_re = re.compile(r"pull/(\d+)", re.ASCII)  # reqex to find PR number
+closes_re = re.compile(
+	r"\b(?:close[sd]?|fix(?:e[sd])?|resolve[sd]?):?\s+(?:\S*#|\S+/issues/)\d+",
+	re.IGNORECASE,
+)  # regex to find closing keywords, e.g. "Fixes #123"
+backport_re = re.compile(r"\(backport #(\d+)\)", re.ASCII)  # regex to find original PR number
 DB_NAME = "stored_lines"
 
 
@@ -18,17 +24,16 @@ DB_NAME = "stored_lines"
 def main(repo: str, tag: str, owner: str = "frappe"):
 	db = get_db()
 	github = GitHubClient(config["GH_TOKEN"])
+	max_patch_size = int(config["MAX_PATCH_SIZE"])
 	release = github.get_release(owner, repo, tag)
 	body = release["body"]
 	print("-" * 4, "Original", "-" * 4)
 	print(body)
 	print("")
-	print("-" * 4, "Modified", "-" * 4)
-	body_lines = body.split("\n")
-	for i, line in enumerate(body_lines.copy()):
-		if not line.startswith("* "):
+	body_lines = body.splitlines()
+	for i, line in enumerate(body_lines):
+		if not line.startswith("* ") or "/pull/" not in line:
 			continue
-		line = line[2:]
 		match = pr_re.search(line)
 		if not match:
 			continue
@@ -38,25 +43,28 @@ def main(repo: str, tag: str, owner: str = "frappe"):
 		pr_title = pr["title"]
 
 		original_pr_no = None
-		original_pr_match = re.search(r"\(backport #(\d+)\)", pr_title)
+		original_pr_match = backport_re.search(pr_title)
 		if original_pr_match:
 			original_pr_no = original_pr_match[1]
 
 		stored_sentence = db.get_sentence(owner, repo, original_pr_no or pr_no)
 		if stored_sentence:
 			body_lines[i] = format_line(stored_sentence, pr_web_url)
-			print(body_lines[i])
 			continue
 
 		pr_body = pr["body"]
-		pr_patch = github.get_text(pr["patch_url"])
-		if len(pr_patch) > int(config["MAX_PATCH_SIZE"]):
+		pr_patch = github.get_pr_patch(pr["patch_url"], max_patch_size)
+		if pr_patch is None:
 			pr_patch = "\n".join(
 				commit["commit"]["message"]
 				for commit in github.get_commit_messages(pr["commits_url"])
 			)
 
-		closed_issues = github.get_closed_issues(owner, repo, pr_no) or github.get_closed_issues(owner, repo, original_pr_no)
+		closed_issues = None
+		if pr_body and closes_re.search(pr_body):
+			closed_issues = github.get_closed_issues(owner, repo, pr_no)
+		if not closed_issues and original_pr_no:
+			closed_issues = github.get_closed_issues(owner, repo, original_pr_no)
 
 		issue_body = None
 		issue_title = None
@@ -70,20 +78,14 @@ def main(repo: str, tag: str, owner: str = "frappe"):
 			db.store_sentence(owner, repo, original_pr_no or pr_no, pr_sentence)
 			body_lines[i] = format_line(pr_sentence, pr_web_url)
 
-		print(body_lines[i])
-
-	# print remaining lines
-	for x in range(i - 1, len(body_lines)):
-		print(body_lines[x])
+	print("-" * 4, "Modified", "-" * 4)
+	print("\n".join(body_lines))
 
 
 def get_pr_sentence(pr_title: str, pr_body: str, pr_patch: str, issue_body: str, issue_title: str) -> str:
 	"""Get a single sentence to describe a PR."""
-	client = OpenAI(
-		# This is the default and can be omitted
-		api_key=config["OPENAI_API_KEY"],
-	)
-	prompt = Path("prompt.txt").read_text()
+	client = get_openai_client(config["OPENAI_API_KEY"])
+	prompt = get_prompt()
 	pr_text = f"""PR Title: {pr_title}\n\nPR Body: {pr_body}\n\nPR Patch or commit messages: {pr_patch}"""
 	issue_text = f"""Issue Title: {issue_title}\n\nIssue Body: {issue_body}""" if issue_title and issue_body else ""
 	content = prompt
@@ -110,6 +112,18 @@ def get_pr_sentence(pr_title: str, pr_body: str, pr_patch: str, issue_body: str,
 	return chat_completion.choices[0].message.content
 
 
+@lru_cache(maxsize=None)
+def get_prompt() -> str:
+	"""Read the prompt template once, instead of for every PR."""
+	return Path("prompt.txt").read_text()
+
+
+@lru_cache(maxsize=None)
+def get_openai_client(api_key: str) -> OpenAI:
+	"""Get an OpenAI client, reusing its connection pool across calls."""
+	return OpenAI(api_key=api_key)
+
+
 def format_line(sentence: str, url: str) -> str:
 	return f"* {sentence} {url}"
 